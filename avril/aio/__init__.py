@@ -0,0 +1,2 @@
+from .bot import AsyncBotBase
+from .skill import AsyncSkillBase
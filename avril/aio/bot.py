@@ -0,0 +1,277 @@
+from abc import ABC, abstractmethod
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import inspect
+import json
+from logging import getLogger
+from time import time
+import traceback
+from sqlalchemy import select
+from ..models import (
+    State, User, Request, Response,
+    ConversationHistory, HistoryVerbosity,
+)
+
+
+async def call_hook(func, *args):
+    # hooks can be implemented either as sync or async function
+    result = func(*args)
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+
+class AsyncBotBase(ABC):
+    skills = []
+    request_class = Request
+    response_class = Response
+    conversation_history_class = ConversationHistory
+
+    def __init__(self, *, db_session_maker=None, logger=None,
+                 threads=None, state_timeout=300,
+                 history_verbosity=HistoryVerbosity.All,
+                 max_concurrency=None, history_writer=None):
+        # db_session_maker should make AsyncSession
+        self.db_session = db_session_maker
+        self.logger = logger or getLogger(__name__)
+        # threads to run sync skills
+        self.executor = ThreadPoolExecutor(
+            max_workers=threads, thread_name_prefix="SyncSkill"
+        )
+        self.state_timeout = state_timeout
+        self.history_verbosity = history_verbosity
+        self.history_writer = history_writer
+        self.max_concurrency = max_concurrency
+        self.__semaphore = None
+        self.__tasks = {}
+        self.__skills = {s.topic: s for s in self.skills}
+        if len(self.__skills) == 0:
+            self.logger.warning("No skills has been registered yet.")
+
+    def register_skill(self, skill):
+        self.skills.append(skill)
+        self.__skills[skill.topic] = skill
+
+    async def get_state(self, db, request):
+        # get or create state
+        state = (await db.execute(
+            select(State).where(State.id == request.source_id)
+        )).scalars().first()
+
+        if not state:
+            state = State(id=request.source_id, data={})
+            db.add(state)
+            await db.flush()
+        else:
+            gap = datetime.utcnow() - state.updated_at
+            if gap.total_seconds() > self.state_timeout:
+                state.clear()
+
+        return state
+
+    async def get_user(self, db, request, update_profile=True):
+        # get or create user
+        user = (await db.execute(
+            select(User).where(User.id == request.source_id)
+        )).scalars().first()
+
+        if not user:
+            user = User(id=request.source_id, data={})
+            db.add(user)
+            await db.flush()
+
+        return user
+
+    @abstractmethod
+    def extract_intent(self, request, user, state):
+        pass
+
+    def route(self, request, user, state):
+        if request.intent in self.__skills:
+            # clear state and set intent to topic to start skill
+            state.clear()
+            state.topic = request.intent
+
+        if state.topic in self.__skills:
+            # start or continue skill match to topic
+            return self.__skills[state.topic](self)
+
+    async def execute_skill(self, skill, request, user, state):
+        if inspect.iscoroutinefunction(skill.process_request):
+            return await skill.process_request(request, user, state)
+        else:
+            # run sync skill in thread not to block event loop
+            return await asyncio.get_event_loop().run_in_executor(
+                self.executor, skill.process_request, request, user, state
+            )
+
+    @abstractmethod
+    def process_response(self, request, user, state, response):
+        pass
+
+    async def process_events(self, events):
+        try:
+            db = self.db_session()
+        except Exception as ex:
+            self.logger.error(
+                "Error in connecting to database: "
+                + f"{str(ex)}\n{traceback.format_exc()}"
+            )
+            raise ex
+
+        for event in events:
+            start_time = time()
+            conversation_history = self.conversation_history_class()
+            state = None
+            user = None
+
+            try:
+                # parse event to request
+                request = self.request_class.from_event(event)
+                conversation_history.request = request
+
+                # get state
+                state = await self.get_state(db, request)
+                if self.history_verbosity > \
+                        HistoryVerbosity.RequestAndResponse:
+                    conversation_history.state_on_start = state
+
+                # get user
+                user = await self.get_user(db, request)
+                if self.history_verbosity > \
+                        HistoryVerbosity.RequestAndResponse:
+                    conversation_history.user_on_start = user
+
+                # extract intent
+                intent_entities = await call_hook(
+                    self.extract_intent, request, user, state)
+                if isinstance(intent_entities, tuple):
+                    request.intent, request.entities = intent_entities
+                else:
+                    request.intent = intent_entities
+                    request.entities = {}
+                conversation_history.intent = request.intent
+                conversation_history.entities = request.entities
+
+                # route to skill
+                skill = self.route(request, user, state)
+                if skill is None:
+                    self.logger.info("No skill found")
+                    continue
+
+                # execute skill
+                response = await self.execute_skill(
+                    skill, request, user, state)
+                if not isinstance(response, self.response_class):
+                    response = self.response_class(response)
+                conversation_history.response = response
+
+                # process response
+                await call_hook(
+                    self.process_response, request, user, state, response)
+
+                # clear state
+                if response.end_session:
+                    state.clear()
+
+            except Exception as ex:
+                self.logger.error(
+                    "Error in processing event: "
+                    + f"{str(ex)}\n{traceback.format_exc()}"
+                )
+                conversation_history.error = json.dumps(
+                    {"message": str(ex), "trace": traceback.format_exc()}
+                )
+                if state:
+                    # clear state on error
+                    state.clear()
+
+            finally:
+                try:
+                    # serialize state and user to save in database
+                    if state is not None:
+                        state.serialize_data()
+                        if self.history_verbosity > \
+                                HistoryVerbosity.RequestAndResponse:
+                            conversation_history.state_on_end = state
+                    if user is not None:
+                        user.serialize_data()
+                        if self.history_verbosity > \
+                                HistoryVerbosity.RequestAndResponse:
+                            conversation_history.user_on_end = user
+
+                    # conversation history
+                    conversation_history.response_time =\
+                        int((time() - start_time) * 1000)
+                    if self.history_verbosity > HistoryVerbosity.Nothing \
+                            and self.history_writer is None:
+                        db.add(conversation_history)
+
+                    await db.commit()
+
+                    if self.history_verbosity > HistoryVerbosity.Nothing \
+                            and self.history_writer is not None:
+                        # write history in background
+                        self.history_writer.write(conversation_history)
+
+                except Exception as ex:
+                    self.logger.error(
+                        "Error in storing data: "
+                        + f"{str(ex)}\n{traceback.format_exc()}"
+                    )
+
+                    await db.rollback()
+
+        await db.close()
+
+    def get_source_id(self, event):
+        try:
+            return self.request_class.from_event(event).source_id
+        except Exception:
+            # events that can't be parsed are processed (and logged) together
+            return None
+
+    async def __process_after(self, previous_task, events):
+        if previous_task is not None:
+            # wait for the events from the same source to keep order
+            await asyncio.wait([previous_task])
+
+        if self.max_concurrency is None:
+            await self.process_events(events)
+        else:
+            if self.__semaphore is None:
+                self.__semaphore = asyncio.Semaphore(self.max_concurrency)
+            async with self.__semaphore:
+                await self.process_events(events)
+
+    def __on_task_done(self, source_id, task):
+        if self.__tasks.get(source_id) is task:
+            del self.__tasks[source_id]
+        if not task.cancelled() and task.exception() is not None:
+            ex = task.exception()
+            self.logger.error(
+                f"Error in processing events: {str(ex)}\n"
+                + "".join(traceback.format_exception(
+                    type(ex), ex, ex.__traceback__))
+            )
+
+    def enqueue_events(self, events):
+        # split events by source. events from the same source are processed
+        # in order and events from different sources are processed concurrently
+        events_by_source = {}
+        for event in events:
+            events_by_source.setdefault(
+                self.get_source_id(event), []).append(event)
+
+        for source_id, source_events in events_by_source.items():
+            task = asyncio.ensure_future(self.__process_after(
+                self.__tasks.get(source_id), source_events))
+            self.__tasks[source_id] = task
+            task.add_done_callback(
+                lambda t, s=source_id: self.__on_task_done(s, t))
+
+    async def join(self):
+        # wait for all enqueued events to be processed
+        while self.__tasks:
+            await asyncio.wait(list(self.__tasks.values()))
@@ -0,0 +1,8 @@
+from abc import abstractmethod
+from ..skill import SkillBase
+
+
+class AsyncSkillBase(SkillBase):
+    @abstractmethod
+    async def process_request(self, request, user, state):
+        pass
@@ -1,10 +1,10 @@
 from abc import ABC, abstractmethod
-from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import json
 from logging import getLogger
 from time import time
 import traceback
+from .dispatcher import KeyedDispatcher, OverflowPolicy
 from .models import (
     State, User, Request, Response,
     ConversationHistory, HistoryVerbosity,
@@ -19,14 +19,21 @@ class BotBase(ABC):
 
     def __init__(self, *, db_session_maker=None, logger=None,
                  threads=None, state_timeout=300,
-                 history_verbosity=HistoryVerbosity.All):
+                 history_verbosity=HistoryVerbosity.All,
+                 max_queue_size=None,
+                 overflow_policy=OverflowPolicy.Reject,
+                 history_writer=None):
         self.db_session = db_session_maker
         self.logger = logger or getLogger(__name__)
-        self.executor = ThreadPoolExecutor(
-            max_workers=threads, thread_name_prefix="LineEvent"
+        self.dispatcher = KeyedDispatcher(
+            max_workers=threads, thread_name_prefix="LineEvent",
+            logger=self.logger, max_queue_size=max_queue_size,
+            overflow_policy=overflow_policy
         )
+        self.executor = self.dispatcher.executor
         self.state_timeout = state_timeout
         self.history_verbosity = history_verbosity
+        self.history_writer = history_writer
         self.__skills = {s.topic: s for s in self.skills}
         if len(self.__skills) == 0:
             self.logger.warning("No skills has been registered yet.")
@@ -94,6 +101,9 @@ class BotBase(ABC):
         for event in events:
             start_time = time()
             conversation_history = self.conversation_history_class()
+            # skip recording history to catch up when queue is overflowed
+            history_verbosity = HistoryVerbosity.Nothing \
+                if self.dispatcher.is_degraded else self.history_verbosity
             state = None
             user = None
 
@@ -104,13 +114,13 @@ class BotBase(ABC):
 
                 # get state
                 state = self.get_state(db, request)
-                if self.history_verbosity > \
+                if history_verbosity > \
                         HistoryVerbosity.RequestAndResponse:
                     conversation_history.state_on_start = state
 
                 # get user
                 user = self.get_user(db, request)
-                if self.history_verbosity > \
+                if history_verbosity > \
                         HistoryVerbosity.RequestAndResponse:
                     conversation_history.user_on_start = user
 
@@ -160,23 +170,29 @@ class BotBase(ABC):
                     # serialize state and user to save in database
                     if state is not None:
                         state.serialize_data()
-                        if self.history_verbosity > \
+                        if history_verbosity > \
                                 HistoryVerbosity.RequestAndResponse:
                             conversation_history.state_on_end = state
                     if user is not None:
                         user.serialize_data()
-                        if self.history_verbosity > \
+                        if history_verbosity > \
                                 HistoryVerbosity.RequestAndResponse:
                             conversation_history.user_on_end = user
 
                     # conversation history
                     conversation_history.response_time =\
                         int((time() - start_time) * 1000)
-                    if self.history_verbosity > HistoryVerbosity.Nothing:
+                    if history_verbosity > HistoryVerbosity.Nothing \
+                            and self.history_writer is None:
                         db.add(conversation_history)
 
                     db.commit()
 
+                    if history_verbosity > HistoryVerbosity.Nothing \
+                            and self.history_writer is not None:
+                        # write history in background
+                        self.history_writer.write(conversation_history)
+
                 except Exception as ex:
                     self.logger.error(
                         "Error in storing data: "
@@ -187,5 +203,26 @@ class BotBase(ABC):
 
         db.close()
 
+    def get_source_id(self, event):
+        try:
+            return self.request_class.from_event(event).source_id
+        except Exception:
+            # events that can't be parsed are processed (and logged) together
+            return None
+
     def enqueue_events(self, events):
-        self.executor.submit(self.process_events, events)
+        # split events by source. events from the same source are processed
+        # in order and events from different sources are processed in parallel
+        events_by_source = {}
+        for event in events:
+            events_by_source.setdefault(
+                self.get_source_id(event), []).append(event)
+
+        for source_id, source_events in events_by_source.items():
+            self.dispatcher.submit(
+                source_id, self.process_events, source_events)
+
+    def shutdown(self, wait=True):
+        self.dispatcher.shutdown(wait=wait)
+        if self.history_writer is not None:
+            self.history_writer.close()
@@ -0,0 +1,156 @@
+from datetime import datetime
+import json
+from linebot import LineBotApi
+from linebot.exceptions import LineBotApiError
+from linebot.http_client import HttpClient
+from linebot.models import Profile
+from linebot.models.error import Error
+from ...aio import AsyncBotBase
+from ...models import HistoryVerbosity
+from .models import LineRequest, LineResponse
+from .profile import AsyncProfileCache
+
+
+class AsyncLineBotApi:
+    # LINE Messaging API client for the methods that the bot uses
+    def __init__(self, channel_access_token,
+                 endpoint=LineBotApi.DEFAULT_API_ENDPOINT,
+                 timeout=HttpClient.DEFAULT_TIMEOUT, session=None):
+        self.endpoint = endpoint
+        self.headers = {
+            "Authorization": "Bearer " + channel_access_token,
+            "Content-Type": "application/json"
+        }
+        self.timeout = timeout
+        self.session = session
+
+    def get_session(self):
+        # create session in the running event loop
+        if self.session is None:
+            import aiohttp
+            self.session = aiohttp.ClientSession()
+        return self.session
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def __request(self, method, path, data=None, timeout=None):
+        import aiohttp
+        timeout = timeout or self.timeout
+        if isinstance(timeout, tuple):
+            # (connect timeout, read timeout) as well as LineBotApi
+            client_timeout = aiohttp.ClientTimeout(
+                sock_connect=timeout[0], sock_read=timeout[1])
+        else:
+            client_timeout = aiohttp.ClientTimeout(total=timeout)
+
+        async with self.get_session().request(
+            method, self.endpoint + path, headers=self.headers, data=data,
+            timeout=client_timeout
+        ) as response:
+            body = await response.text()
+            if not 200 <= response.status < 300:
+                raise LineBotApiError(
+                    status_code=response.status,
+                    headers=dict(response.headers.items()),
+                    request_id=response.headers.get("X-Line-Request-Id"),
+                    accepted_request_id=response.headers.get(
+                        "X-Line-Accepted-Request-Id"),
+                    error=Error.new_from_json_dict(json.loads(body or "{}"))
+                )
+            return json.loads(body) if body else {}
+
+    async def get_profile(self, user_id, timeout=None):
+        return Profile.new_from_json_dict(await self.__request(
+            "GET", f"/v2/bot/profile/{user_id}", timeout=timeout
+        ))
+
+    async def reply_message(self, reply_token, messages,
+                            notification_disabled=False, timeout=None):
+        if not isinstance(messages, (list, tuple)):
+            messages = [messages]
+        await self.__request("POST", "/v2/bot/message/reply", json.dumps({
+            "replyToken": reply_token,
+            "messages": [m.as_json_dict() for m in messages],
+            "notificationDisabled": notification_disabled,
+        }), timeout=timeout)
+
+    async def push_message(self, to, messages,
+                           notification_disabled=False, timeout=None):
+        if not isinstance(messages, (list, tuple)):
+            messages = [messages]
+        await self.__request("POST", "/v2/bot/message/push", json.dumps({
+            "to": to,
+            "messages": [m.as_json_dict() for m in messages],
+            "notificationDisabled": notification_disabled,
+        }), timeout=timeout)
+
+
+class AsyncLineBotBase(AsyncBotBase):
+    request_class = LineRequest
+    response_class = LineResponse
+
+    def __init__(self, *, line_api, line_parser,
+                 db_session_maker=None, logger=None,
+                 threads=None, state_timeout=300,
+                 history_verbosity=HistoryVerbosity.All,
+                 max_concurrency=None, history_writer=None,
+                 profile_ttl=600):
+        super().__init__(
+            db_session_maker=db_session_maker, logger=logger,
+            threads=threads, state_timeout=state_timeout,
+            history_verbosity=history_verbosity,
+            max_concurrency=max_concurrency,
+            history_writer=history_writer
+        )
+        self.line_api = line_api
+        self.line_parser = line_parser
+        self.profile_ttl = profile_ttl
+        self.profile_cache = AsyncProfileCache(ttl=profile_ttl)
+
+    async def get_user(self, db, request, update_profile=True):
+        if request.source_type == "user":
+            user = await super().get_user(db, request)
+        else:
+            return None
+
+        if update_profile and not self.is_profile_fresh(user):
+            # get user profile from line (concurrent lookups share one call)
+            user_profile = await self.profile_cache.get(
+                request.source_id, self.line_api.get_profile
+            )
+            # update user
+            user.display_name = user_profile.display_name
+            user.language = user_profile.language
+            user.picture_url = user_profile.picture_url
+            user.status_message = user_profile.status_message
+
+        return user
+
+    def is_profile_fresh(self, user):
+        # skip refreshing while the stored profile is updated within ttl
+        if self.profile_ttl <= 0 or user.display_name is None \
+                or user.updated_at is None:
+            return False
+        gap = datetime.utcnow() - user.updated_at
+        return gap.total_seconds() < self.profile_ttl
+
+    async def process_response(self, request, user, state, response):
+        # send response to user
+        if response.messages:
+            await self.line_api.reply_message(
+                request.event.reply_token, response.messages
+            )
+
+    async def process_webhook(self, data, signature):
+        # parse events from webhook request with verifying signature
+        events = self.line_parser.parse(data, signature)
+        # process events
+        await self.process_events(events)
+
+    def enqueue_webhook(self, data, signature):
+        # raises InvalidSignatureError when the signature is invalid
+        events = self.line_parser.parse(data, signature)
+        self.enqueue_events(events)
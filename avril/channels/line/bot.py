@@ -1,6 +1,9 @@
+from datetime import datetime
 from ...bot import BotBase
+from ...dispatcher import OverflowPolicy
 from ...models import HistoryVerbosity
 from .models import LineRequest, LineResponse
+from .profile import ProfileCache
 
 
 class LineBotBase(BotBase):
@@ -10,14 +13,22 @@ class LineBotBase(BotBase):
     def __init__(self, *, line_api, line_parser,
                  db_session_maker=None, logger=None,
                  threads=None, state_timeout=300,
-                 history_verbosity=HistoryVerbosity.All):
+                 history_verbosity=HistoryVerbosity.All,
+                 max_queue_size=None,
+                 overflow_policy=OverflowPolicy.Reject,
+                 history_writer=None, profile_ttl=600):
         super().__init__(
             db_session_maker=db_session_maker, logger=logger,
             threads=threads, state_timeout=state_timeout,
-            history_verbosity=history_verbosity
+            history_verbosity=history_verbosity,
+            max_queue_size=max_queue_size,
+            overflow_policy=overflow_policy,
+            history_writer=history_writer
         )
         self.line_api = line_api
         self.line_parser = line_parser
+        self.profile_ttl = profile_ttl
+        self.profile_cache = ProfileCache(ttl=profile_ttl)
 
     def get_user(self, db, request, update_profile=True):
         if request.source_type == "user":
@@ -25,9 +36,11 @@ class LineBotBase(BotBase):
         else:
             return None
 
-        if update_profile:
-            # get user profile from line
-            user_profile = self.line_api.get_profile(request.source_id)
+        if update_profile and not self.is_profile_fresh(user):
+            # get user profile from line (concurrent lookups share one call)
+            user_profile = self.profile_cache.get(
+                request.source_id, self.line_api.get_profile
+            )
             # update user
             user.display_name = user_profile.display_name
             user.language = user_profile.language
@@ -36,6 +49,14 @@ class LineBotBase(BotBase):
 
         return user
 
+    def is_profile_fresh(self, user):
+        # skip refreshing while the stored profile is updated within ttl
+        if self.profile_ttl <= 0 or user.display_name is None \
+                or user.updated_at is None:
+            return False
+        gap = datetime.utcnow() - user.updated_at
+        return gap.total_seconds() < self.profile_ttl
+
     def process_response(self, request, user, state, response):
         # send response to user
         if response.messages:
@@ -50,4 +71,7 @@ class LineBotBase(BotBase):
         self.process_events(events)
 
     def enqueue_webhook(self, data, signature):
-        self.executor.submit(self.process_webhook, data, signature)
+        # parse here to dispatch events by source. raises
+        # InvalidSignatureError when the signature is invalid
+        events = self.line_parser.parse(data, signature)
+        self.enqueue_events(events)
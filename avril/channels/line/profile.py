@@ -0,0 +1,107 @@
+import asyncio
+from concurrent.futures import Future
+from threading import Lock
+from time import time
+
+
+class ProfileCache:
+    def __init__(self, ttl=600, max_size=10000):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.__profiles = {}
+        self.__inflight = {}
+        self.__lock = Lock()
+
+    def get(self, source_id, loader):
+        with self.__lock:
+            cached = self.__profiles.get(source_id)
+            if cached is not None and cached[0] > time():
+                return cached[1]
+
+            # share the in-flight request for the same source
+            future = self.__inflight.get(source_id)
+            is_owner = future is None
+            if is_owner:
+                future = Future()
+                self.__inflight[source_id] = future
+
+        if not is_owner:
+            return future.result()
+
+        try:
+            profile = loader(source_id)
+        except Exception as ex:
+            # errors are not cached. waiters get the same error
+            with self.__lock:
+                del self.__inflight[source_id]
+            future.set_exception(ex)
+            raise ex
+
+        with self.__lock:
+            del self.__inflight[source_id]
+            self.__profiles.pop(source_id, None)
+            self.__profiles[source_id] = (time() + self.ttl, profile)
+            # evict the oldest entries when the cache is full
+            while len(self.__profiles) > self.max_size:
+                del self.__profiles[next(iter(self.__profiles))]
+        future.set_result(profile)
+
+        return profile
+
+    def invalidate(self, source_id):
+        with self.__lock:
+            self.__profiles.pop(source_id, None)
+
+    def clear(self):
+        with self.__lock:
+            self.__profiles.clear()
+
+
+class AsyncProfileCache:
+    def __init__(self, ttl=600, max_size=10000):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.__profiles = {}
+        self.__inflight = {}
+
+    async def get(self, source_id, loader):
+        cached = self.__profiles.get(source_id)
+        if cached is not None and cached[0] > time():
+            return cached[1]
+
+        # share the in-flight request for the same source
+        future = self.__inflight.get(source_id)
+        if future is not None:
+            return await asyncio.shield(future)
+
+        future = asyncio.get_event_loop().create_future()
+        self.__inflight[source_id] = future
+        try:
+            profile = await loader(source_id)
+        except Exception as ex:
+            # errors are not cached. waiters get the same error
+            del self.__inflight[source_id]
+            future.set_exception(ex)
+            # retrieve exception not to be logged when there are no waiters
+            future.exception()
+            raise ex
+        except asyncio.CancelledError:
+            del self.__inflight[source_id]
+            future.cancel()
+            raise
+
+        del self.__inflight[source_id]
+        self.__profiles.pop(source_id, None)
+        self.__profiles[source_id] = (time() + self.ttl, profile)
+        # evict the oldest entries when the cache is full
+        while len(self.__profiles) > self.max_size:
+            del self.__profiles[next(iter(self.__profiles))]
+        future.set_result(profile)
+
+        return profile
+
+    def invalidate(self, source_id):
+        self.__profiles.pop(source_id, None)
+
+    def clear(self):
+        self.__profiles.clear()
@@ -1 +1,2 @@
 from .history import bp as conversation_history_bp
+from .queue import bp as queue_status_bp
@@ -0,0 +1,8 @@
+from flask import Blueprint, current_app, jsonify
+
+bp = Blueprint("queue_status", __name__)
+
+
+@bp.route("/admin/queue")
+def queue_status():
+    return jsonify(current_app.bot.dispatcher.stats())
@@ -0,0 +1,157 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from logging import getLogger
+from threading import Lock
+import traceback
+
+
+class QueueFullError(Exception):
+    pass
+
+
+class OverflowPolicy:
+    # raise QueueFullError to let the caller respond 503
+    Reject = "reject"
+    # discard the oldest pending task to accept the new one
+    DropOldest = "drop_oldest"
+    # accept the task and process events without recording history
+    Degrade = "degrade"
+
+
+class Task:
+    def __init__(self, fn, args, kwargs):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.dropped = False
+        self.started = False
+
+
+class KeyedDispatcher:
+    def __init__(self, max_workers=None, thread_name_prefix="",
+                 logger=None, max_queue_size=None,
+                 overflow_policy=OverflowPolicy.Reject):
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=thread_name_prefix
+        )
+        self.logger = logger or getLogger(__name__)
+        self.max_queue_size = max_queue_size
+        self.overflow_policy = overflow_policy
+        # pending tasks for each key. a key exists while its task is running
+        self.__queues = {}
+        # tasks in order of submission to find the oldest pending one
+        self.__submitted = deque()
+        self.__queue_depth = 0
+        self.__active_workers = 0
+        self.__counters = {
+            "completed": 0, "rejected": 0, "dropped": 0, "degraded": 0
+        }
+        self.__lock = Lock()
+
+    @property
+    def queue_depth(self):
+        return self.__queue_depth
+
+    @property
+    def is_degraded(self):
+        return self.overflow_policy == OverflowPolicy.Degrade \
+            and self.max_queue_size is not None \
+            and self.__queue_depth >= self.max_queue_size
+
+    def stats(self):
+        with self.__lock:
+            stats = {
+                "queue_depth": self.__queue_depth,
+                "max_queue_size": self.max_queue_size,
+                "active_workers": self.__active_workers,
+                "max_workers": self.executor._max_workers,
+            }
+            stats.update(self.__counters)
+            return stats
+
+    def __drop_oldest(self):
+        while self.__submitted:
+            task = self.__submitted.popleft()
+            if not task.started and not task.dropped:
+                task.dropped = True
+                self.__queue_depth -= 1
+                self.__counters["dropped"] += 1
+                self.logger.warning("Queue is full. Oldest task is dropped.")
+                return
+
+    def submit(self, key, fn, *args, **kwargs):
+        task = Task(fn, args, kwargs)
+
+        with self.__lock:
+            if self.max_queue_size is not None \
+                    and self.__queue_depth >= self.max_queue_size:
+                if self.overflow_policy == OverflowPolicy.DropOldest:
+                    self.__drop_oldest()
+                elif self.overflow_policy == OverflowPolicy.Degrade:
+                    self.__counters["degraded"] += 1
+                else:
+                    self.__counters["rejected"] += 1
+                    raise QueueFullError(
+                        f"Queue is full ({self.__queue_depth} tasks)")
+
+            self.__queue_depth += 1
+            if self.overflow_policy == OverflowPolicy.DropOldest:
+                # forget tasks that have already started
+                while self.__submitted and self.__submitted[0].started:
+                    self.__submitted.popleft()
+                self.__submitted.append(task)
+
+            queue = self.__queues.get(key)
+            if queue is not None:
+                # run after the running task for the same key
+                queue.append(task)
+                return
+            self.__queues[key] = deque()
+
+        try:
+            self.executor.submit(self.__run, key, task)
+        except Exception as ex:
+            with self.__lock:
+                del self.__queues[key]
+                task.dropped = True
+                self.__queue_depth -= 1
+            raise ex
+
+    def __run(self, key, task):
+        while True:
+            with self.__lock:
+                is_dropped = task.dropped
+                if not is_dropped:
+                    task.started = True
+                    self.__queue_depth -= 1
+                    self.__active_workers += 1
+
+            if not is_dropped:
+                try:
+                    task.fn(*task.args, **task.kwargs)
+                except Exception as ex:
+                    self.logger.error(
+                        "Error in dispatched task: "
+                        + f"{str(ex)}\n{traceback.format_exc()}"
+                    )
+
+            with self.__lock:
+                if not is_dropped:
+                    self.__active_workers -= 1
+                    self.__counters["completed"] += 1
+                queue = self.__queues[key]
+                if not queue:
+                    del self.__queues[key]
+                    return
+                task = queue.popleft()
+
+            try:
+                # resubmit instead of looping to let other keys take turns
+                self.executor.submit(self.__run, key, task)
+                return
+            except RuntimeError:
+                # executor is shutting down. run the rest in this thread
+                pass
+
+    def shutdown(self, wait=True):
+        self.executor.shutdown(wait=wait)
@@ -0,0 +1,108 @@
+import atexit
+from datetime import datetime
+from logging import getLogger
+from threading import Condition, Thread
+from time import time
+import traceback
+
+
+class HistoryWriter:
+    def __init__(self, db_session_maker, *, batch_size=100,
+                 flush_interval=1000, max_buffer_size=10000, logger=None):
+        self.db_session = db_session_maker
+        self.batch_size = batch_size
+        # milliseconds to wait for batch_size histories
+        self.flush_interval = flush_interval
+        self.max_buffer_size = max_buffer_size
+        self.logger = logger or getLogger(__name__)
+        self.__buffer = []
+        self.__condition = Condition()
+        self.__closed = False
+        self.__thread = Thread(
+            target=self.__run, name="HistoryWriter", daemon=True)
+        self.__thread.start()
+        # flush histories in buffer on shutdown
+        atexit.register(self.close)
+
+    @property
+    def buffer_size(self):
+        return len(self.__buffer)
+
+    def write(self, history):
+        # record the time of the event instead of the time of insert
+        if history.updated_at is None:
+            history.updated_at = datetime.utcnow()
+
+        with self.__condition:
+            # block until buffer is flushed when buffer is full
+            while len(self.__buffer) >= self.max_buffer_size \
+                    and not self.__closed:
+                self.__condition.wait()
+
+            if not self.__closed:
+                self.__buffer.append(history)
+                if len(self.__buffer) >= self.batch_size:
+                    self.__condition.notify_all()
+                return
+
+        # write immediately after closed
+        self.__write_histories([history])
+
+    def flush(self):
+        with self.__condition:
+            histories, self.__buffer = self.__buffer, []
+            self.__condition.notify_all()
+        self.__write_histories(histories)
+
+    def close(self):
+        with self.__condition:
+            if self.__closed:
+                return
+            self.__closed = True
+            self.__condition.notify_all()
+        self.__thread.join()
+
+    def __run(self):
+        while True:
+            with self.__condition:
+                # wait for the first history
+                while not self.__buffer and not self.__closed:
+                    self.__condition.wait()
+
+                # wait until batch_size histories or flush_interval passed
+                deadline = time() + self.flush_interval / 1000
+                while len(self.__buffer) < self.batch_size \
+                        and not self.__closed:
+                    remaining = deadline - time()
+                    if remaining <= 0:
+                        break
+                    self.__condition.wait(remaining)
+
+                histories, self.__buffer = self.__buffer, []
+                is_closed = self.__closed
+                self.__condition.notify_all()
+
+            self.__write_histories(histories)
+
+            if is_closed and not self.__buffer:
+                return
+
+    def __write_histories(self, histories):
+        if not histories:
+            return
+
+        db = self.db_session()
+        try:
+            # insert all histories at once
+            db.bulk_save_objects(histories)
+            db.commit()
+
+        except Exception as ex:
+            self.logger.error(
+                f"Error in storing {len(histories)} histories: "
+                + f"{str(ex)}\n{traceback.format_exc()}"
+            )
+            db.rollback()
+
+        finally:
+            db.close()
@@ -10,3 +10,21 @@ class Database:
             autoflush=False,
             bind=self.engine
         )
+
+
+class AsyncDatabase:
+    def __init__(self, connection_string):
+        # e.g. sqlite+aiosqlite:///linebot.db
+        from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+        self.engine = create_async_engine(connection_string)
+        self.session = sessionmaker(
+            autocommit=False,
+            autoflush=False,
+            expire_on_commit=False,
+            bind=self.engine,
+            class_=AsyncSession
+        )
+
+    async def create_all(self, base):
+        async with self.engine.begin() as conn:
+            await conn.run_sync(base.metadata.create_all)
@@ -0,0 +1,19 @@
+import asyncio
+from avril.aio import AsyncSkillBase
+from avril.channels.line.aio import AsyncLineBotBase
+
+
+class AsyncEchoSkill(AsyncSkillBase):
+    topic = "AsyncEcho"
+
+    async def process_request(self, request, user, state):
+        # do something async here. e.g. call external api with aiohttp
+        await asyncio.sleep(0)
+        return request.event.message.text
+
+
+class AsyncEchoBot(AsyncLineBotBase):
+    skills = [AsyncEchoSkill]
+
+    def extract_intent(self, request, user, state):
+        return AsyncEchoSkill.topic
@@ -0,0 +1,53 @@
+from configparser import ConfigParser
+from aiohttp import web
+from linebot import WebhookParser
+from linebot.exceptions import InvalidSignatureError
+from database import AsyncDatabase
+from avril.models import Base
+from avril.channels.line.aio import AsyncLineBotApi
+from examples.async_echo import AsyncEchoBot
+
+# load config
+config = ConfigParser()
+config.read("./config.ini")
+
+# create db (e.g. sqlite+aiosqlite:///linebot.db)
+db = AsyncDatabase(config["DATABASE"]["async_connection_string"])
+
+# create bot
+bot = AsyncEchoBot(
+    line_api=AsyncLineBotApi(config["LINE_API"]["channel_access_token"]),
+    line_parser=WebhookParser(config["LINE_API"]["channel_secret"]),
+    db_session_maker=db.session)
+
+
+async def handle_webhook(request):
+    # put webhook request data to the event loop
+    try:
+        bot.enqueue_webhook(
+            (await request.read()).decode("utf-8"),
+            request.headers.get("X-Line-Signature")
+        )
+    except InvalidSignatureError:
+        raise web.HTTPBadRequest()
+
+    # return immediately
+    return web.Response(text="ok")
+
+
+async def on_startup(app):
+    # create tables
+    await db.create_all(Base)
+
+
+async def on_cleanup(app):
+    await bot.join()
+    await bot.line_api.close()
+
+
+if __name__ == "__main__":
+    app = web.Application()
+    app.router.add_post("/bot/webhook_handler", handle_webhook)
+    app.on_startup.append(on_startup)
+    app.on_cleanup.append(on_cleanup)
+    web.run_app(app, host="0.0.0.0", port=12345)
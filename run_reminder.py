@@ -1,10 +1,12 @@
 import os
 from configparser import ConfigParser
-from flask import Flask, request
+from flask import Flask, Response, request, abort
 from linebot import LineBotApi, WebhookParser
+from linebot.exceptions import InvalidSignatureError
 from database import Database
 from avril.models import create_all
-from avril.controllers import conversation_history_bp
+from avril.controllers import conversation_history_bp, queue_status_bp
+from avril.dispatcher import QueueFullError
 from examples.reminder import ReminderBot
 from examples.reminder.workers.notifier import start_notifier_thread
 
@@ -22,15 +24,22 @@ app.bot = ReminderBot(
     line_parser=WebhookParser(config["LINE_API"]["channel_secret"]),
     db_session_maker=db.session, logger=app.logger)
 app.register_blueprint(conversation_history_bp)
+app.register_blueprint(queue_status_bp)
 
 
 @app.route("/bot/webhook_handler", methods=["POST"])
 def handle_webhook():
     # put webhook request data to queue
-    app.bot.enqueue_webhook(
-        request.data.decode("utf-8"),
-        request.headers.get("X-Line-Signature")
-    )
+    try:
+        app.bot.enqueue_webhook(
+            request.data.decode("utf-8"),
+            request.headers.get("X-Line-Signature")
+        )
+    except InvalidSignatureError:
+        abort(400)
+    except QueueFullError:
+        # let LINE platform know that the bot is busy
+        return Response("busy", status=503)
 
     # return immediately
     return "ok"
@@ -0,0 +1,148 @@
+import asyncio
+from configparser import ConfigParser
+from uuid import uuid4
+import json
+from sqlalchemy import desc, select
+from avril import SkillBase
+from avril.aio import AsyncBotBase, AsyncSkillBase
+from avril.models import Base, ConversationHistory, Request
+from database import AsyncDatabase
+
+# load config
+config = ConfigParser()
+config.read("tests/tests.ini")
+
+
+class AsyncMultiTurnSkill(AsyncSkillBase):
+    topic = "AsyncMultiTurn"
+
+    async def process_request(self, request, user, state):
+        await asyncio.sleep(0.01)
+        if request.intent == self.topic:
+            state.data["count"] = 1
+        elif "err" in request.event["text"]:
+            raise Exception("error occured in process_request")
+        else:
+            state.data["count"] += 1
+        return self.bot.response_class(
+            messages=f"turn {state.data['count']}",
+            end_session=False
+        )
+
+
+class SyncSkill(SkillBase):
+    topic = "Sync"
+
+    def process_request(self, request, user, state):
+        return "sync " + request.event["text"]
+
+
+class AsyncBotForTest(AsyncBotBase):
+    skills = [AsyncMultiTurnSkill, SyncSkill]
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.response_buffer = []
+
+    async def extract_intent(self, request, user, state):
+        if request.event["text"] == "multi_turn":
+            return AsyncMultiTurnSkill.topic
+        if request.event["text"].startswith("sync"):
+            return SyncSkill.topic, {}
+
+    async def process_response(self, request, user, state, response):
+        self.response_buffer.append(response)
+
+
+def run_with_bot(coro_func):
+    async def run():
+        db = AsyncDatabase(config["DATABASE"]["async_connection_string"])
+        await db.create_all(Base)
+        bot = AsyncBotForTest(db_session_maker=db.session, state_timeout=5)
+        try:
+            return await coro_func(bot)
+        finally:
+            await db.engine.dispose()
+    return asyncio.run(run())
+
+
+class TestAsyncBotBase:
+    def test_get_state_and_user(self):
+        async def test(bot):
+            user_id = str(uuid4())
+            db = bot.db_session()
+            try:
+                state = await bot.get_state(db, Request(source_id=user_id))
+                assert state.data == {}
+                state.data["key"] = "val"
+                state.serialize_data()
+                user = await bot.get_user(db, Request(source_id=user_id))
+                assert user.id == user_id
+                assert user.updated_at is not None
+                await db.commit()
+
+                state = await bot.get_state(db, Request(source_id=user_id))
+                assert state.data["key"] == "val"
+            finally:
+                await db.close()
+
+        run_with_bot(test)
+
+    def test_process_events(self):
+        async def test(bot):
+            user_id = str(uuid4())
+            await bot.process_events([
+                {"text": "multi_turn", "source_id": user_id},
+                {"text": "continue", "source_id": user_id},
+                {"text": "sync skill", "source_id": user_id},
+            ])
+            return bot.response_buffer
+
+        responses = run_with_bot(test)
+        assert responses[0].messages == ["turn 1"]
+        assert responses[1].messages == ["turn 2"]
+        # sync skill runs in thread
+        assert responses[2].messages == ["sync sync skill"]
+
+    def test_process_events_error(self):
+        async def test(bot):
+            user_id = str(uuid4())
+            await bot.process_events([
+                {"text": "multi_turn", "source_id": user_id},
+                {"text": "err", "source_id": user_id},
+            ])
+            db = bot.db_session()
+            try:
+                return (await db.execute(
+                    select(ConversationHistory).
+                    where(ConversationHistory.source_id == user_id).
+                    order_by(desc(ConversationHistory.updated_at))
+                )).scalars().first()
+            finally:
+                await db.close()
+
+        history = run_with_bot(test)
+        assert json.loads(history.error)["message"] == \
+            "error occured in process_request"
+        assert json.loads(history.state_on_end)["data"] == {}
+
+    def test_enqueue_events(self):
+        async def test(bot):
+            user_1 = str(uuid4())
+            user_2 = str(uuid4())
+            bot.enqueue_events([
+                {"text": "multi_turn", "source_id": user_1},
+                {"text": "multi_turn", "source_id": user_2},
+            ])
+            bot.enqueue_events([
+                {"text": "continue", "source_id": user_1},
+                {"text": "continue", "source_id": user_2},
+                {"text": "continue", "source_id": user_1},
+            ])
+            await bot.join()
+            return bot.response_buffer
+
+        responses = run_with_bot(test)
+        messages = sorted(r.messages[0] for r in responses)
+        # events from the same user are processed in order
+        assert messages == ["turn 1", "turn 1", "turn 2", "turn 2", "turn 3"]
@@ -0,0 +1,58 @@
+import asyncio
+import json
+import pytest
+from aiohttp import web
+from linebot.exceptions import LineBotApiError
+from linebot.models import TextSendMessage
+from avril.channels.line.aio import AsyncLineBotApi
+
+
+async def start_line_api_server(received):
+    async def get_profile(request):
+        user_id = request.match_info["user_id"]
+        if user_id == "unknown_user_id":
+            return web.json_response({"message": "Not found"}, status=404)
+        return web.json_response({
+            "userId": user_id, "displayName": "dummy user"
+        })
+
+    async def reply(request):
+        received.append(json.loads(await request.text()))
+        return web.json_response({})
+
+    app = web.Application()
+    app.router.add_get("/v2/bot/profile/{user_id}", get_profile)
+    app.router.add_post("/v2/bot/message/reply", reply)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+class TestAsyncLineBotApi:
+    def test_api(self):
+        async def test():
+            received = []
+            runner, endpoint = await start_line_api_server(received)
+            line_api = AsyncLineBotApi("token", endpoint=endpoint)
+            try:
+                profile = await line_api.get_profile("user_id")
+                assert profile.user_id == "user_id"
+                assert profile.display_name == "dummy user"
+
+                with pytest.raises(LineBotApiError) as ex:
+                    await line_api.get_profile("unknown_user_id")
+                assert ex.value.status_code == 404
+
+                await line_api.reply_message(
+                    "reply_token", TextSendMessage(text="hello"))
+                assert received[0]["replyToken"] == "reply_token"
+                assert received[0]["messages"][0]["text"] == "hello"
+
+            finally:
+                await line_api.close()
+                await runner.cleanup()
+
+        asyncio.run(test())
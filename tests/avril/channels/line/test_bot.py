@@ -218,6 +218,47 @@ class TestLineBotBase:
         finally:
             db.close()
 
+    def test_get_user_profile_cache(self, bot):
+        profile_calls = []
+
+        class DummyProfile:
+            display_name = "dummy user"
+            language = "ja"
+            picture_url = None
+            status_message = None
+
+        def get_profile(user_id, timeout=None):
+            profile_calls.append(user_id)
+            return DummyProfile()
+        bot.line_api.get_profile = get_profile
+
+        db = bot.db_session()
+        try:
+            user_id = str(uuid4())
+            request = LineRequest.from_event(
+                MessageEvent(source=SourceUser(user_id=user_id))
+            )
+
+            # profile is fetched for new user
+            user = bot.get_user(db, request)
+            assert user.display_name == "dummy user"
+            db.commit()
+            assert profile_calls == [user_id]
+
+            # profile is not fetched while the stored profile is fresh
+            user = bot.get_user(db, request)
+            assert user.display_name == "dummy user"
+            assert profile_calls == [user_id]
+
+            # profile is refreshed after ttl
+            bot.profile_ttl = 0
+            bot.profile_cache.clear()
+            user = bot.get_user(db, request)
+            assert profile_calls == [user_id, user_id]
+
+        finally:
+            db.close()
+
     def test_process_response(self, bot):
         # create LINE MessageEvents manually
         event_1 = MessageEvent(
@@ -0,0 +1,121 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+from time import sleep
+import pytest
+from avril.channels.line.profile import AsyncProfileCache, ProfileCache
+
+
+class TestProfileCache:
+    def test_get(self):
+        calls = []
+
+        def loader(source_id):
+            calls.append(source_id)
+            return f"profile of {source_id}"
+
+        cache = ProfileCache(ttl=1)
+        assert cache.get("user_1", loader) == "profile of user_1"
+        assert cache.get("user_1", loader) == "profile of user_1"
+        assert cache.get("user_2", loader) == "profile of user_2"
+        assert calls == ["user_1", "user_2"]
+
+        # expired
+        sleep(1.1)
+        assert cache.get("user_1", loader) == "profile of user_1"
+        assert calls == ["user_1", "user_2", "user_1"]
+
+        # invalidated
+        cache.invalidate("user_2")
+        assert cache.get("user_2", loader) == "profile of user_2"
+        assert calls == ["user_1", "user_2", "user_1", "user_2"]
+
+    def test_get_max_size(self):
+        cache = ProfileCache(ttl=60, max_size=2)
+        calls = []
+
+        def loader(source_id):
+            calls.append(source_id)
+            return source_id
+
+        for source_id in ["user_1", "user_2", "user_3", "user_1"]:
+            cache.get(source_id, loader)
+        assert calls == ["user_1", "user_2", "user_3", "user_1"]
+
+    def test_get_single_flight(self):
+        cache = ProfileCache(ttl=60)
+        calls = []
+        started = Event()
+
+        def loader(source_id):
+            calls.append(source_id)
+            started.set()
+            sleep(0.5)
+            return f"profile of {source_id}"
+
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            first = executor.submit(cache.get, "user_1", loader)
+            started.wait()
+            others = [
+                executor.submit(cache.get, "user_1", loader)
+                for _ in range(4)
+            ]
+            results = [f.result() for f in [first] + others]
+
+        assert calls == ["user_1"]
+        assert results == ["profile of user_1"] * 5
+
+    def test_get_error(self):
+        cache = ProfileCache(ttl=60)
+
+        def error_loader(source_id):
+            raise Exception("profile api error")
+
+        with pytest.raises(Exception):
+            cache.get("user_1", error_loader)
+
+        # error is not cached
+        assert cache.get("user_1", lambda s: "recovered") == "recovered"
+
+
+class TestAsyncProfileCache:
+    def test_get_single_flight(self):
+        cache = AsyncProfileCache(ttl=60)
+        calls = []
+
+        async def loader(source_id):
+            calls.append(source_id)
+            await asyncio.sleep(0.1)
+            return f"profile of {source_id}"
+
+        async def test():
+            return await asyncio.gather(
+                *[cache.get("user_1", loader) for _ in range(5)],
+                cache.get("user_2", loader)
+            )
+
+        results = asyncio.run(test())
+        assert calls == ["user_1", "user_2"]
+        assert results == ["profile of user_1"] * 5 + ["profile of user_2"]
+
+    def test_get_error(self):
+        cache = AsyncProfileCache(ttl=60)
+
+        async def error_loader(source_id):
+            await asyncio.sleep(0.1)
+            raise Exception("profile api error")
+
+        async def recovered_loader(source_id):
+            return "recovered"
+
+        async def test():
+            results = await asyncio.gather(
+                cache.get("user_1", error_loader),
+                cache.get("user_1", error_loader),
+                return_exceptions=True
+            )
+            assert all(isinstance(r, Exception) for r in results)
+            # error is not cached
+            assert await cache.get("user_1", recovered_loader) == "recovered"
+
+        asyncio.run(test())
@@ -5,6 +5,7 @@ import json
 import pytest
 from sqlalchemy import desc
 from avril import BotBase, SkillBase
+from avril.history import HistoryWriter
 from avril.models import (
     State, ConversationHistory, HistoryVerbosity, Request, Response, create_all
 )
@@ -422,6 +423,24 @@ class TestBotBase:
         }])
         assert len(bot.response_buffer) == 7
 
+    def test_enqueue_events(self, bot):
+        user_1 = str(uuid4())
+        user_2 = str(uuid4())
+
+        bot.enqueue_events([
+            {"text": "multi_turn", "source_id": user_1},
+            {"text": "multi_turn", "source_id": user_2},
+            {"text": "continue", "source_id": user_1},
+            {"text": "continue", "source_id": user_1},
+            {"text": "continue", "source_id": user_2},
+        ])
+        bot.dispatcher.shutdown()
+
+        # events from the same user are processed in order
+        assert self.get_state(bot, user_1).data["count"] == 3
+        assert self.get_state(bot, user_2).data["count"] == 2
+        assert len(bot.response_buffer) == 5
+
     def test_process_events_history(self, bot):
         user_id = str(uuid4())
         messages = [
@@ -503,6 +522,26 @@ class TestBotBase:
         finally:
             db.close()
 
+    def test_process_events_history_writer(self, bot):
+        user_id = str(uuid4())
+        bot.history_writer = HistoryWriter(
+            bot.db_session, batch_size=100, flush_interval=60000)
+
+        bot.process_events([
+            {"text": "multi_turn", "source_id": user_id},
+            {"text": "continue", "source_id": user_id},
+        ])
+        # histories are buffered
+        assert self.get_last_history(bot, user_id) is None
+        assert bot.history_writer.buffer_size == 2
+
+        # histories are stored on shutdown
+        bot.shutdown()
+        conversation_history = self.get_last_history(bot, user_id)
+        assert conversation_history.request["event"]["text"] == "continue"
+        assert json.loads(conversation_history.state_on_end)["data"] == \
+            {"count": 2}
+
     def test_process_events_history_reqresonly(self, bot):
         user_id = str(uuid4())
         db = bot.db_session()
@@ -0,0 +1,131 @@
+from threading import Event, Lock
+from time import sleep
+import pytest
+from avril.dispatcher import KeyedDispatcher, OverflowPolicy, QueueFullError
+
+
+class TestKeyedDispatcher:
+    def test_submit_ordered_by_key(self):
+        dispatcher = KeyedDispatcher(max_workers=4)
+        results = {"user_1": [], "user_2": []}
+
+        def task(key, i):
+            # later tasks finish faster unless they are serialized
+            sleep(0.05 if i % 2 == 0 else 0.01)
+            results[key].append(i)
+
+        for i in range(10):
+            dispatcher.submit("user_1", task, "user_1", i)
+            dispatcher.submit("user_2", task, "user_2", i)
+        dispatcher.shutdown()
+
+        assert results["user_1"] == list(range(10))
+        assert results["user_2"] == list(range(10))
+
+    def test_submit_parallel_between_keys(self):
+        dispatcher = KeyedDispatcher(max_workers=2)
+        blocker = Event()
+        done = Event()
+
+        # slow task for user_1 doesn't block user_2
+        dispatcher.submit("user_1", blocker.wait, 5)
+        dispatcher.submit("user_2", done.set)
+        assert done.wait(1)
+        blocker.set()
+        dispatcher.shutdown()
+
+    def test_submit_error(self):
+        dispatcher = KeyedDispatcher(max_workers=1)
+        results = []
+
+        def error_task():
+            raise Exception("error in task")
+
+        # error doesn't stop following tasks
+        dispatcher.submit("user_1", error_task)
+        dispatcher.submit("user_1", results.append, "after error")
+        dispatcher.shutdown()
+
+        assert results == ["after error"]
+
+    def test_submit_concurrency(self):
+        dispatcher = KeyedDispatcher(max_workers=8)
+        lock = Lock()
+        running = {}
+        overlapped = []
+
+        def task(key):
+            with lock:
+                if running.get(key):
+                    overlapped.append(key)
+                running[key] = True
+            sleep(0.001)
+            with lock:
+                running[key] = False
+
+        for i in range(200):
+            dispatcher.submit(i % 5, task, i % 5)
+        dispatcher.shutdown()
+
+        assert overlapped == []
+
+    def test_submit_reject(self):
+        dispatcher = KeyedDispatcher(max_workers=1, max_queue_size=2)
+        blocker = Event()
+        results = []
+
+        # first task is running and the others are pending
+        dispatcher.submit("user_1", blocker.wait, 5)
+        sleep(0.1)
+        dispatcher.submit("user_1", results.append, 1)
+        dispatcher.submit("user_2", results.append, 2)
+        assert dispatcher.queue_depth == 2
+        with pytest.raises(QueueFullError):
+            dispatcher.submit("user_3", results.append, 3)
+
+        blocker.set()
+        dispatcher.shutdown()
+        assert sorted(results) == [1, 2]
+        stats = dispatcher.stats()
+        assert stats["queue_depth"] == 0
+        assert stats["rejected"] == 1
+        assert stats["completed"] == 3
+
+    def test_submit_drop_oldest(self):
+        dispatcher = KeyedDispatcher(
+            max_workers=1, max_queue_size=2,
+            overflow_policy=OverflowPolicy.DropOldest)
+        blocker = Event()
+        results = []
+
+        dispatcher.submit("user_1", blocker.wait, 5)
+        sleep(0.1)
+        for i in range(5):
+            dispatcher.submit(f"user_{i % 2}", results.append, i)
+        assert dispatcher.queue_depth == 2
+
+        blocker.set()
+        dispatcher.shutdown()
+        assert sorted(results) == [3, 4]
+        assert dispatcher.stats()["dropped"] == 3
+
+    def test_submit_degrade(self):
+        dispatcher = KeyedDispatcher(
+            max_workers=1, max_queue_size=1,
+            overflow_policy=OverflowPolicy.Degrade)
+        blocker = Event()
+        results = []
+
+        dispatcher.submit("user_1", blocker.wait, 5)
+        sleep(0.1)
+        dispatcher.submit("user_1", results.append, 1)
+        assert dispatcher.is_degraded is True
+        # accepted even when the queue is full
+        dispatcher.submit("user_2", results.append, 2)
+        assert dispatcher.queue_depth == 2
+
+        blocker.set()
+        dispatcher.shutdown()
+        assert sorted(results) == [1, 2]
+        assert dispatcher.is_degraded is False
+        assert dispatcher.stats()["degraded"] == 1
@@ -0,0 +1,95 @@
+from configparser import ConfigParser
+from time import sleep
+from uuid import uuid4
+from avril.history import HistoryWriter
+from avril.models import ConversationHistory, Request, create_all
+from database import Database
+
+# load config
+config = ConfigParser()
+config.read("tests/tests.ini")
+
+# initialize database
+db = Database(config["DATABASE"]["connection_string"])
+create_all(db.engine)
+
+
+def create_history(source_id, text):
+    history = ConversationHistory()
+    history.request = Request(event={"text": text}, source_id=source_id)
+    return history
+
+
+def count_histories(source_id):
+    session = db.session()
+    try:
+        return session.query(ConversationHistory).\
+            filter(ConversationHistory.source_id == source_id).count()
+    finally:
+        session.close()
+
+
+class TestHistoryWriter:
+    def test_write_batch_size(self):
+        writer = HistoryWriter(db.session, batch_size=3, flush_interval=60000)
+        user_id = str(uuid4())
+        try:
+            writer.write(create_history(user_id, "1"))
+            writer.write(create_history(user_id, "2"))
+            sleep(0.2)
+            assert count_histories(user_id) == 0
+            assert writer.buffer_size == 2
+
+            # flushed when batch_size histories are buffered
+            writer.write(create_history(user_id, "3"))
+            sleep(0.2)
+            assert count_histories(user_id) == 3
+            assert writer.buffer_size == 0
+
+        finally:
+            writer.close()
+
+    def test_write_flush_interval(self):
+        writer = HistoryWriter(db.session, batch_size=100, flush_interval=200)
+        user_id = str(uuid4())
+        try:
+            history = create_history(user_id, "1")
+            writer.write(history)
+            # the time of writing is recorded
+            assert history.updated_at is not None
+            assert count_histories(user_id) == 0
+
+            # flushed after flush_interval
+            sleep(0.5)
+            assert count_histories(user_id) == 1
+
+        finally:
+            writer.close()
+
+    def test_close(self):
+        writer = HistoryWriter(db.session, batch_size=100, flush_interval=60000)
+        user_id = str(uuid4())
+        for i in range(5):
+            writer.write(create_history(user_id, str(i)))
+
+        # flushed on close
+        writer.close()
+        assert count_histories(user_id) == 5
+
+        # written immediately after closed
+        writer.write(create_history(user_id, "after closed"))
+        assert count_histories(user_id) == 5 + 1
+
+    def test_write_max_buffer_size(self):
+        writer = HistoryWriter(
+            db.session, batch_size=100, flush_interval=100, max_buffer_size=2)
+        user_id = str(uuid4())
+        try:
+            # blocks until buffer is flushed instead of growing buffer
+            for i in range(5):
+                writer.write(create_history(user_id, str(i)))
+                assert writer.buffer_size <= 2
+
+        finally:
+            writer.close()
+        assert count_histories(user_id) == 5